@@ -1,623 +1,838 @@
-# SHA_Connect.py
-# Kisumu County Referral Hospital - SHA Awareness Platform
-# Fully integrated: multilingual UI, FAQs & chatbot (OpenAI optional),
-# SMS/Voice (Twilio optional), persistent local caching, outbox queue, analytics, partners, feedback, reminders, dashboard.
-#
-# Usage:
-# 1. put this file in a folder
-# 2. create a ./data folder (the app will create it automatically)
-# 3. set credentials in Streamlit secrets or environment variables:
-#    - For Twilio (optional): in Streamlit secrets
-#        [twilio]
-#        account_sid = "ACxxxxx"
-#        auth_token = "xxxx"
-#        from_number = "+1...."
-#    - For OpenAI (optional): in Streamlit secrets
-#        [openai]
-#        api_key = "sk-..."
-#
-# Run: streamlit run SHA_Connect.py
-
-import streamlit as st
-import pandas as pd
-import numpy as np
-import datetime
-import os
-import json
-import traceback
-
-# Optional dependencies (import safely)
-try:
-    from twilio.rest import Client as TwilioClient
-except Exception:
-    TwilioClient = None
-
-try:
-    import openai
-except Exception:
-    openai = None
-
-try:
-    from googletrans import Translator as GTTranslator
-except Exception:
-    GTTranslator = None
-
-# ---------------------------
-# Configuration & data paths
-# ---------------------------
-DATA_DIR = "./data"
-os.makedirs(DATA_DIR, exist_ok=True)
-
-PARTNERS_FILE = os.path.join(DATA_DIR, "partners.json")
-MESSAGES_FILE = os.path.join(DATA_DIR, "message_logs.json")
-FEEDBACK_FILE = os.path.join(DATA_DIR, "feedback.json")
-REMINDERS_FILE = os.path.join(DATA_DIR, "reminders.json")
-OUTBOX_FILE = os.path.join(DATA_DIR, "outbox.json")
-
-# ---------------------------
-# Helpers: JSON persistence
-# ---------------------------
-def save_df_to_file(df: pd.DataFrame, path: str):
-    try:
-        # to_json with force_ascii=False preserves unicode (local languages)
-        df.to_json(path, orient="records", force_ascii=False, date_format="iso")
-    except Exception:
-        # fallback using python json
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(df.to_dict(orient="records"), f, ensure_ascii=False, indent=2)
-
-def load_df_from_file(path: str, columns=None):
-    if not os.path.isfile(path):
-        if columns:
-            return pd.DataFrame(columns=columns)
-        return pd.DataFrame()
-    try:
-        df = pd.read_json(path, orient="records")
-        if columns:
-            # ensure expected columns exist
-            for c in columns:
-                if c not in df.columns:
-                    df[c] = ""
-            return df[columns]
-        return df
-    except Exception:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                records = json.load(f)
-            df = pd.DataFrame(records)
-            if columns:
-                for c in columns:
-                    if c not in df.columns:
-                        df[c] = ""
-                return df[columns]
-            return df
-        except Exception:
-            return pd.DataFrame()
-
-# ---------------------------
-# App UI / startup
-# ---------------------------
-st.set_page_config(page_title="SHA Connect — Kisumu County Referral Hospital", layout="wide")
-st.title("SHA Connect — Kisumu County Referral Hospital")
-st.markdown("An awareness & outreach platform (Swahili, Luo, Luhya, English).")
-
-# Sidebar navigation
-st.sidebar.title("Navigation")
-PAGES = [
-    "Home",
-    "FAQs & Chatbot",
-    "Multilingual Messages",
-    "Outreach Partners",
-    "Community Feedback",
-    "Notifications & Reminders",
-    "Campaign Dashboard",
-    "Outbox",
-    "Settings"
-]
-choice = st.sidebar.radio("Go to:", PAGES)
-
-language_options = ["English", "Swahili", "Luo", "Luhya"]
-selected_language = st.sidebar.selectbox("Choose Language:", language_options)
-
-# ---------------------------
-# Load persisted data into session state
-# ---------------------------
-if "partners_df" not in st.session_state:
-    st.session_state.partners_df = load_df_from_file(PARTNERS_FILE, columns=["Name", "Role", "Language", "Contact", "Campaign Assigned"])
-
-if "message_logs" not in st.session_state:
-    st.session_state.message_logs = load_df_from_file(MESSAGES_FILE, columns=["Recipient", "Message", "Language", "Date Sent", "Type", "Status"])
-
-if "feedback_df" not in st.session_state:
-    st.session_state.feedback_df = load_df_from_file(FEEDBACK_FILE, columns=["Name", "Message", "Language", "Date Submitted"])
-
-if "reminders_df" not in st.session_state:
-    st.session_state.reminders_df = load_df_from_file(REMINDERS_FILE, columns=["Task", "Due Date", "Assigned To", "Status"])
-
-if "outbox_df" not in st.session_state:
-    st.session_state.outbox_df = load_df_from_file(OUTBOX_FILE, columns=["Recipient", "Message", "Language", "Date Created", "Type", "Attempts"])
-
-# ---------------------------
-# Translation utilities and custom translations
-# ---------------------------
-# Use GoogleTrans when available, else rely on custom dictionary / pass-through.
-gt_translator = GTTranslator() if GTTranslator else None
-
-custom_translations = {
-    "Luo": {
-        "What is SHA?": "SHA en Social Health Authority, ma orit gi dhok yi mondo giko gi bedo mag dhok.",
-        "How can I register for SHA?": "Inyalo registr kendo e health center maduong' gi e SHA portal.",
-        "Which services are covered?": "SHA en giko mag preventive care, maternal care, kod treatments ma nyaka.",
-        "Thank you for your feedback!": "Awuoyo gi nyalo walo!"
-    },
-    "Luhya": {
-        "What is SHA?": "SHA ni Social Health Authority, ebuya amagara netaweire.",
-        "How can I register for SHA?": "Olwikhilire kuhealth center oba e SHA portal.",
-        "Which services are covered?": "SHA ibuyire preventive care, maternal care, ne essential treatments.",
-        "Thank you for your feedback!": "Webale muno okhu"
-    }
-}
-
-def safe_translate(text: str, lang: str) -> str:
-    """
-    Robust translation helper:
-    - If lang is English: return text
-    - If custom translation exists (Luo/Luhya) and exact phrase matches: use it
-    - If googletrans available and lang == Swahili: translate via googletrans
-    - On any error: return original text
-    """
-    if not text:
-        return text
-    # exact-match custom translations for Luo/Luhya
-    if lang in ("Luo", "Luhya"):
-        return custom_translations.get(lang, {}).get(text, text)
-    if lang == "English":
-        return text
-    if lang == "Swahili":
-        if gt_translator:
-            try:
-                return gt_translator.translate(text, dest="sw").text
-            except Exception:
-                return text
-        else:
-            return text
-    return text
-
-# ---------------------------
-# FAQs
-# ---------------------------
-faqs = {
-    "What is SHA?": "SHA stands for Social Health Authority, which provides health services and benefits.",
-    "How can I register for SHA?": "You can register at your nearest health center or via the SHA portal.",
-    "Which services are covered?": "SHA covers preventive care, maternal care, and essential treatments."
-}
-
-# ---------------------------
-# Twilio + OpenAI configuration helpers
-# ---------------------------
-def twilio_configured() -> bool:
-    # prefer st.secrets; fall back to env
-    has_secrets = ("twilio" in st.secrets and "account_sid" in st.secrets["twilio"] and
-                   "auth_token" in st.secrets["twilio"] and "from_number" in st.secrets["twilio"])
-    if has_secrets:
-        return True
-    # fallback to env
-    return bool(os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_AUTH_TOKEN") and os.getenv("TWILIO_PHONE_NUMBER"))
-
-def get_twilio_client():
-    if not twilio_configured():
-        return None
-    try:
-        if "twilio" in st.secrets:
-            sid = st.secrets["twilio"]["account_sid"]
-            token = st.secrets["twilio"]["auth_token"]
-        else:
-            sid = os.getenv("TWILIO_ACCOUNT_SID")
-            token = os.getenv("TWILIO_AUTH_TOKEN")
-        if TwilioClient is None:
-            return None
-        return TwilioClient(sid, token)
-    except Exception:
-        return None
-
-def openai_configured() -> bool:
-    return ("openai" in st.secrets and "api_key" in st.secrets["openai"]) or bool(os.getenv("OPENAI_API_KEY"))
-
-def configure_openai_api():
-    if not openai_configured() or openai is None:
-        return False
-    try:
-        if "openai" in st.secrets:
-            openai.api_key = st.secrets["openai"]["api_key"]
-        else:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-        return True
-    except Exception:
-        return False
-
-# Safe Twilio send functions (wrap in try/except)
-def safe_send_sms(to_number: str, body: str):
-    client = get_twilio_client()
-    if client is None:
-        return False, "Twilio not configured or library missing."
-    try:
-        from_number = st.secrets["twilio"]["from_number"] if "twilio" in st.secrets else os.getenv("TWILIO_PHONE_NUMBER")
-        msg = client.messages.create(body=body, from_=from_number, to=to_number)
-        return True, getattr(msg, "sid", "sent")
-    except Exception as e:
-        return False, str(e)
-
-def safe_make_call(to_number: str, text_to_say: str):
-    client = get_twilio_client()
-    if client is None:
-        return False, "Twilio not configured or library missing."
-    try:
-        from_number = st.secrets["twilio"]["from_number"] if "twilio" in st.secrets else os.getenv("TWILIO_PHONE_NUMBER")
-        call = client.calls.create(twiml=f'<Response><Say>{text_to_say}</Say></Response>', from_=from_number, to=to_number)
-        return True, getattr(call, "sid", "call-initiated")
-    except Exception as e:
-        return False, str(e)
-
-# ---------------------------
-# Outbox management
-# ---------------------------
-def add_to_outbox(recipient, message, language, msg_type="sms"):
-    row = {
-        "Recipient": recipient,
-        "Message": message,
-        "Language": language,
-        "Date Created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "Type": msg_type,
-        "Attempts": 0
-    }
-    st.session_state.outbox_df = pd.concat([st.session_state.outbox_df, pd.DataFrame([row])], ignore_index=True)
-    save_df_to_file(st.session_state.outbox_df, OUTBOX_FILE)
-    st.success("Message queued to outbox.")
-
-def process_outbox(max_attempts=3):
-    if st.session_state.outbox_df.empty:
-        st.info("Outbox is empty.")
-        return []
-    results = []
-    # iterate over a copy to allow deletions
-    for idx, row in st.session_state.outbox_df.copy().iterrows():
-        attempts = int(row.get("Attempts", 0))
-        if attempts >= max_attempts:
-            results.append((idx, False, "max attempts reached"))
-            continue
-        recipient = row["Recipient"]
-        message = row["Message"]
-        msg_type = row.get("Type", "sms")
-        language = row.get("Language", "English")
-        if msg_type == "sms":
-            ok, info = safe_send_sms(recipient, message)
-        else:
-            ok, info = safe_make_call(recipient, message)
-        # update attempts
-        st.session_state.outbox_df.at[idx, "Attempts"] = attempts + 1
-        if ok:
-            # log into message_logs
-            sent_row = {
-                "Recipient": recipient,
-                "Message": message,
-                "Language": language,
-                "Date Sent": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "Type": msg_type,
-                "Status": "Sent"
-            }
-            st.session_state.message_logs = pd.concat([st.session_state.message_logs, pd.DataFrame([sent_row])], ignore_index=True)
-            # remove from outbox
-            st.session_state.outbox_df = st.session_state.outbox_df.drop(idx)
-            results.append((idx, True, info))
-        else:
-            results.append((idx, False, info))
-    # persist changes
-    save_df_to_file(st.session_state.outbox_df, OUTBOX_FILE)
-    save_df_to_file(st.session_state.message_logs, MESSAGES_FILE)
-    return results
-
-# ---------------------------
-# Utility: persist all main tables
-# ---------------------------
-def persist_all():
-    save_df_to_file(st.session_state.partners_df, PARTNERS_FILE)
-    save_df_to_file(st.session_state.message_logs, MESSAGES_FILE)
-    save_df_to_file(st.session_state.feedback_df, FEEDBACK_FILE)
-    save_df_to_file(st.session_state.reminders_df, REMINDERS_FILE)
-    save_df_to_file(st.session_state.outbox_df, OUTBOX_FILE)
-
-# ---------------------------
-# Pages / Functionality
-# ---------------------------
-if choice == "Home":
-    st.subheader("Home")
-    st.markdown("""
-    - Learn about SHA services.
-    - Access resources and community outreach events.
-    - Use the sidebar to navigate: FAQs & Chatbot, Messaging, Partners, Feedback, Reminders, Dashboard.
-    """)
-    st.info("App caches data locally in ./data — this helps in areas with intermittent internet. Use the Outbox page to re-send queued messages when network is back.")
-
-# ---------------------------
-# FAQs & Chatbot
-# ---------------------------
-elif choice == "FAQs & Chatbot":
-    st.subheader("FAQs")
-    for q, a in faqs.items():
-        with st.expander(safe_translate(q, selected_language)):
-            st.write(safe_translate(a, selected_language))
-
-    st.subheader("Ask the Chatbot")
-    user_input = st.text_input("Type your question here:")
-    if st.button("Get Answer"):
-        if not user_input:
-            st.warning("Please enter a question.")
-        else:
-            # Prefer OpenAI if configured and available
-            if openai and configure_openai_api():
-                try:
-                    # Use ChatCompletion (gpt-3.5-turbo or gpt-4 depending on user)
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "system", "content": "You are a helpful assistant for SHA health services in Kisumu. Keep answers short and local-language friendly."},
-                                  {"role": "user", "content": user_input}]
-                    )
-                    answer = response.choices[0].message.content.strip()
-                    st.markdown(f"**Chatbot (AI) Response:** {safe_translate(answer, selected_language)}")
-                except Exception as e:
-                    st.error(f"OpenAI error: {e}")
-                    # fallback to simple keyword-based reply
-                    fallback = "Sorry, I couldn't fetch an AI response. Here is a simple answer attempt."
-                    for q, a in faqs.items():
-                        if user_input.lower() in q.lower() or user_input.lower() in a.lower():
-                            fallback = a
-                            break
-                    st.markdown(f"**Chatbot (Fallback):** {safe_translate(fallback, selected_language)}")
-            else:
-                # simple keyword-based chatbot
-                response = "Sorry, I don't have an answer for that yet."
-                for q, a in faqs.items():
-                    if user_input.lower() in q.lower() or user_input.lower() in a.lower():
-                        response = a
-                        break
-                st.markdown(f"**Chatbot Response:** {safe_translate(response, selected_language)}")
-
-# ---------------------------
-# Multilingual Messages (SMS/Voice)
-# ---------------------------
-elif choice == "Multilingual Messages":
-    st.subheader("Send Multilingual Messages")
-    if not twilio_configured() or TwilioClient is None:
-        st.warning("Twilio not configured or library missing. Messages will be queued to Outbox if 'Send' is attempted. To enable live SMS/Voice, set Twilio credentials in Streamlit secrets or environment variables and install twilio library.")
-    recipient = st.text_input("Recipient phone number (with country code):")
-    msg_text = st.text_area("Message text")
-    col1, col2 = st.columns(2)
-    with col1:
-        msg_type = st.selectbox("Message Type", ["sms", "voice"])
-    with col2:
-        msg_lang = st.selectbox("Message Language", language_options, index=language_options.index(selected_language))
-    if st.button("Send Now"):
-        if not recipient or not msg_text:
-            st.warning("Please enter recipient and message.")
-        else:
-            translated = safe_translate(msg_text, msg_lang)
-            if msg_type == "sms":
-                ok, info = safe_send_sms(recipient, translated) if twilio_configured() and TwilioClient else (False, "Twilio not configured")
-                if ok:
-                    st.success(f"SMS sent: {info}")
-                    log_row = {
-                        "Recipient": recipient,
-                        "Message": translated,
-                        "Language": msg_lang,
-                        "Date Sent": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "Type": "sms",
-                        "Status": "Sent"
-                    }
-                    st.session_state.message_logs = pd.concat([st.session_state.message_logs, pd.DataFrame([log_row])], ignore_index=True)
-                    save_df_to_file(st.session_state.message_logs, MESSAGES_FILE)
-                else:
-                    st.error(f"Send failed: {info} — queued to Outbox.")
-                    add_to_outbox(recipient, translated, msg_lang, msg_type="sms")
-            else:
-                ok, info = safe_make_call(recipient, translated) if twilio_configured() and TwilioClient else (False, "Twilio not configured")
-                if ok:
-                    st.success(f"Voice call initiated: {info}")
-                    log_row = {
-                        "Recipient": recipient,
-                        "Message": translated,
-                        "Language": msg_lang,
-                        "Date Sent": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "Type": "voice",
-                        "Status": "Sent"
-                    }
-                    st.session_state.message_logs = pd.concat([st.session_state.message_logs, pd.DataFrame([log_row])], ignore_index=True)
-                    save_df_to_file(st.session_state.message_logs, MESSAGES_FILE)
-                else:
-                    st.error(f"Voice send failed: {info} — queued to Outbox.")
-                    add_to_outbox(recipient, translated, msg_lang, msg_type="voice")
-    st.markdown("#### Recent messages")
-    if not st.session_state.message_logs.empty:
-        st.dataframe(st.session_state.message_logs.sort_values("Date Sent", ascending=False).head(15))
-    else:
-        st.info("No messages logged yet.")
-
-# ---------------------------
-# Outreach Partners
-# ---------------------------
-elif choice == "Outreach Partners":
-    st.subheader("Community & Influencer Outreach")
-    with st.expander("Add New Partner"):
-        name = st.text_input("Partner Name")
-        role = st.selectbox("Role", ["Community Leader", "Influencer", "Volunteer"])
-        langs = st.multiselect("Languages Spoken", language_options)
-        contact = st.text_input("Contact Info (phone/email)")
-        campaign = st.text_input("Campaign Assigned")
-        if st.button("Add Partner"):
-            if not name:
-                st.warning("Partner name is required.")
-            else:
-                new_partner = {
-                    "Name": name,
-                    "Role": role,
-                    "Language": ", ".join(langs),
-                    "Contact": contact,
-                    "Campaign Assigned": campaign
-                }
-                st.session_state.partners_df = pd.concat([st.session_state.partners_df, pd.DataFrame([new_partner])], ignore_index=True)
-                save_df_to_file(st.session_state.partners_df, PARTNERS_FILE)
-                st.success(f"Partner {name} added.")
-    st.markdown("#### Registered Partners")
-    if not st.session_state.partners_df.empty:
-        st.dataframe(st.session_state.partners_df)
-    else:
-        st.info("No partners registered yet.")
-    search = st.text_input("Search partner by name")
-    if search:
-        filtered = st.session_state.partners_df[st.session_state.partners_df["Name"].str.contains(search, case=False, na=False)]
-        st.dataframe(filtered)
-
-# ---------------------------
-# Community Feedback
-# ---------------------------
-elif choice == "Community Feedback":
-    st.subheader("Community Feedback")
-    with st.expander("Submit Feedback"):
-        fname = st.text_input("Your Name")
-        fmsg = st.text_area("Your Feedback")
-        flang = st.selectbox("Language", language_options, index=language_options.index(selected_language) if selected_language in language_options else 0)
-        if st.button("Submit Feedback"):
-            if not fname or not fmsg:
-                st.warning("Please enter your name and feedback.")
-            else:
-                new_fb = {
-                    "Name": fname,
-                    "Message": fmsg,
-                    "Language": flang,
-                    "Date Submitted": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                st.session_state.feedback_df = pd.concat([st.session_state.feedback_df, pd.DataFrame([new_fb])], ignore_index=True)
-                save_df_to_file(st.session_state.feedback_df, FEEDBACK_FILE)
-                conf = safe_translate("Thank you for your feedback!", flang)
-                st.success(conf)
-    st.markdown("#### Feedback Received")
-    if not st.session_state.feedback_df.empty:
-        st.dataframe(st.session_state.feedback_df.sort_values("Date Submitted", ascending=False))
-        st.markdown("#### Feedback Analytics (by language)")
-        st.bar_chart(st.session_state.feedback_df["Language"].value_counts())
-    else:
-        st.info("No feedback yet.")
-
-# ---------------------------
-# Notifications & Reminders
-# ---------------------------
-elif choice == "Notifications & Reminders":
-    st.subheader("Staff Notifications & Reminders")
-    with st.expander("Add New Reminder"):
-        task = st.text_input("Task Description")
-        due_date = st.date_input("Due Date", datetime.date.today())
-        assigned_to = st.text_input("Assigned To")
-        if st.button("Add Reminder"):
-            if not task or not assigned_to:
-                st.warning("Please enter task and assignee.")
-            else:
-                new_rem = {
-                    "Task": task,
-                    "Due Date": due_date.strftime("%Y-%m-%d"),
-                    "Assigned To": assigned_to,
-                    "Status": "Pending"
-                }
-                st.session_state.reminders_df = pd.concat([st.session_state.reminders_df, pd.DataFrame([new_rem])], ignore_index=True)
-                save_df_to_file(st.session_state.reminders_df, REMINDERS_FILE)
-                st.success(f"Reminder for '{task}' added.")
-    st.markdown("#### Upcoming Reminders")
-    if not st.session_state.reminders_df.empty:
-        st.dataframe(st.session_state.reminders_df)
-        pending_tasks = st.session_state.reminders_df[st.session_state.reminders_df["Status"] == "Pending"]["Task"].tolist()
-        if pending_tasks:
-            selected_task = st.selectbox("Mark completed", pending_tasks)
-            if st.button("Mark Completed"):
-                st.session_state.reminders_df.loc[st.session_state.reminders_df["Task"] == selected_task, "Status"] = "Completed"
-                save_df_to_file(st.session_state.reminders_df, REMINDERS_FILE)
-                st.success(f"Task '{selected_task}' marked completed.")
-    else:
-        st.info("No reminders yet.")
-
-# ---------------------------
-# Campaign Dashboard
-# ---------------------------
-elif choice == "Campaign Dashboard":
-    st.subheader("📊 Campaign Dashboard")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("### Messages Sent")
-        if not st.session_state.message_logs.empty:
-            st.metric("Total Messages Sent", len(st.session_state.message_logs))
-            st.bar_chart(st.session_state.message_logs["Language"].value_counts())
-        else:
-            st.info("No messages sent yet.")
-    with col2:
-        st.markdown("### Outreach Partners")
-        if not st.session_state.partners_df.empty:
-            st.metric("Total Partners", len(st.session_state.partners_df))
-            st.bar_chart(st.session_state.partners_df["Role"].value_counts())
-        else:
-            st.info("No partners added yet.")
-    st.markdown("### Community Feedback")
-    if not st.session_state.feedback_df.empty:
-        st.metric("Total Feedback Received", len(st.session_state.feedback_df))
-        st.bar_chart(st.session_state.feedback_df["Language"].value_counts())
-    else:
-        st.info("No feedback yet.")
-    st.markdown("### Reminders")
-    if not st.session_state.reminders_df.empty:
-        pending = len(st.session_state.reminders_df[st.session_state.reminders_df["Status"] == "Pending"])
-        completed = len(st.session_state.reminders_df[st.session_state.reminders_df["Status"] == "Completed"])
-        st.metric("Pending Reminders", pending)
-        st.metric("Completed Reminders", completed)
-        st.dataframe(st.session_state.reminders_df)
-    else:
-        st.info("No reminders yet.")
-
-# ---------------------------
-# Outbox (queued messages)
-# ---------------------------
-elif choice == "Outbox":
-    st.subheader("Outbox — queued messages waiting for send")
-    st.markdown("Messages that failed to send (Twilio errors or offline) appear here. Use 'Process Outbox' when network is available.")
-    if not st.session_state.outbox_df.empty:
-        st.dataframe(st.session_state.outbox_df)
-    else:
-        st.info("Outbox is empty.")
-    if st.button("Process Outbox (attempt send)"):
-        with st.spinner("Processing outbox..."):
-            try:
-                results = process_outbox()
-                if not results:
-                    st.info("No messages processed.")
-                else:
-                    for idx, ok, info in results:
-                        if ok:
-                            st.success(f"Outbox item {idx} sent: {info}")
-                        else:
-                            st.error(f"Outbox item {idx} NOT sent: {info}")
-            except Exception:
-                st.error("Error while processing outbox.")
-                st.text(traceback.format_exc())
-
-# ---------------------------
-# Settings
-# ---------------------------
-elif choice == "Settings":
-    st.subheader("Settings & Credentials")
-    st.markdown("**Twilio:** optional — configure in Streamlit Secrets or environment variables.")
-    tw_conf = twilio_configured()
-    st.write(f"Twilio configured: {tw_conf}")
-    st.markdown("**OpenAI:** optional — configure in Streamlit Secrets or environment variables.")
-    st.write(f"OpenAI library installed: {openai is not None}, configured: {openai_configured()}")
-    st.markdown("**Local cache path**: `./data`")
-    if st.button("Save all data to disk now"):
-        persist_all()
-        st.success("All data saved.")
-
-# Persist state on every run
-persist_all()
+# SHA_Connect.py
+# Kisumu County Referral Hospital - SHA Awareness Platform
+# Fully integrated: multilingual UI, FAQs & chatbot (OpenAI optional),
+# SMS/Voice (Twilio optional), persistent local caching, outbox queue, analytics, partners, feedback, reminders, dashboard.
+#
+# Usage:
+# 1. put this file in a folder
+# 2. create a ./data folder (the app will create it automatically)
+# 3. set credentials in Streamlit secrets or environment variables:
+#    - For Twilio (optional): in Streamlit secrets
+#        [twilio]
+#        account_sid = "ACxxxxx"
+#        auth_token = "xxxx"
+#        from_number = "+1...."
+#    - For OpenAI (optional): in Streamlit secrets
+#        [openai]
+#        api_key = "sk-..."
+#
+# Run: streamlit run SHA_Connect.py
+
+import streamlit as st
+import datetime
+import os
+import json
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TypedDict
+
+# orjson backs persistence, so it is imported eagerly; the heavier optional
+# dependencies (twilio, openai, googletrans) are imported lazily below and
+# only when their feature is actually used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=None)
+def _twilio_client_cls():
+    try:
+        from twilio.rest import Client
+        return Client
+    except Exception:
+        return None
+
+@lru_cache(maxsize=None)
+def _openai_module():
+    try:
+        import openai
+        return openai
+    except Exception:
+        return None
+
+@lru_cache(maxsize=None)
+def _gt_translator():
+    try:
+        from googletrans import Translator
+        return Translator()
+    except Exception:
+        return None
+
+# ---------------------------
+# Configuration & data paths
+# ---------------------------
+DATA_DIR = "./data"
+os.makedirs(DATA_DIR, exist_ok=True)
+
+PARTNERS_FILE = os.path.join(DATA_DIR, "partners.json")
+MESSAGES_FILE = os.path.join(DATA_DIR, "message_logs.ndjson")
+FEEDBACK_FILE = os.path.join(DATA_DIR, "feedback.ndjson")
+REMINDERS_FILE = os.path.join(DATA_DIR, "reminders.json")
+OUTBOX_FILE = os.path.join(DATA_DIR, "outbox.ndjson")
+
+# Tables are small (tens to low thousands of rows), so they are plain lists
+# of typed dicts end to end; st.dataframe and st.bar_chart take these
+# directly without a pandas dependency. Functional TypedDict syntax because
+# several column names contain spaces.
+PartnerRow = TypedDict("PartnerRow", {"Name": str, "Role": str, "Language": str, "Contact": str, "Campaign Assigned": str})
+MessageRow = TypedDict("MessageRow", {"Recipient": str, "Message": str, "Language": str, "Date Sent": int, "Type": str, "Status": str})
+FeedbackRow = TypedDict("FeedbackRow", {"Name": str, "Message": str, "Language": str, "Date Submitted": int})
+ReminderRow = TypedDict("ReminderRow", {"Task": str, "Due Date": str, "Assigned To": str, "Status": str})
+OutboxRow = TypedDict("OutboxRow", {"Recipient": str, "Message": str, "Language": str, "Date Created": int, "Type": str, "Attempts": int})
+
+PARTNER_COLUMNS = list(PartnerRow.__annotations__)
+MESSAGE_COLUMNS = list(MessageRow.__annotations__)
+FEEDBACK_COLUMNS = list(FeedbackRow.__annotations__)
+REMINDER_COLUMNS = list(ReminderRow.__annotations__)
+OUTBOX_COLUMNS = list(OutboxRow.__annotations__)
+
+TABLE_FILES = {
+    "partners": PARTNERS_FILE,
+    "message_logs": MESSAGES_FILE,
+    "feedback": FEEDBACK_FILE,
+    "reminders": REMINDERS_FILE,
+    "outbox": OUTBOX_FILE,
+}
+
+TABLE_COLUMNS = {
+    "partners": PARTNER_COLUMNS,
+    "message_logs": MESSAGE_COLUMNS,
+    "feedback": FEEDBACK_COLUMNS,
+    "reminders": REMINDER_COLUMNS,
+    "outbox": OUTBOX_COLUMNS,
+}
+
+# append-heavy tables stored as NDJSON (one record per line) so a new row
+# is a single appended line instead of a full-file rewrite
+NDJSON_TABLES = {"message_logs", "feedback", "outbox"}
+
+# ---------------------------
+# Helpers: timestamps
+# ---------------------------
+# Rows store integer epochs — no strftime on the write path, numeric sorting —
+# and only the rendered tables pay for formatting. Records written by earlier
+# versions carry preformatted strings; the helpers pass those through.
+def now_ts() -> int:
+    return int(time.time())
+
+def format_ts(value) -> str:
+    if isinstance(value, (int, float)):
+        return datetime.datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+def ts_sort_key(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S").timestamp()
+    except Exception:
+        return 0.0
+
+# ---------------------------
+# Helpers: JSON persistence
+# ---------------------------
+def _dumps_row(row) -> bytes:
+    # orjson is ~5x faster than stdlib json and emits UTF-8 bytes directly,
+    # which preserves unicode (local languages); stdlib is the fallback
+    if orjson:
+        return orjson.dumps(row)
+    return json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+def save_rows_to_file(rows: list, path: str):
+    if orjson:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(rows))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+def append_ndjson(path: str, rows: list):
+    # persist only the delta: one line per new record
+    with open(path, "ab") as f:
+        for row in rows:
+            f.write(_dumps_row(row) + b"\n")
+
+def save_ndjson(path: str, rows: list):
+    # compaction pass — full rewrite, only needed after deletions or in-place edits
+    with open(path, "wb") as f:
+        for row in rows:
+            f.write(_dumps_row(row) + b"\n")
+
+@st.cache_data
+def _load_records(path: str, mtime: float):
+    # cached per (path, mtime): a rewrite bumps mtime and naturally misses,
+    # so new sessions in the same process reuse the parsed records for free
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".ndjson"):
+        loads = orjson.loads if orjson else json.loads
+        return [loads(line) for line in raw.splitlines() if line.strip()]
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def load_rows_from_file(path: str, columns=None):
+    if not os.path.isfile(path):
+        # migrate array-style .json files written by earlier versions
+        legacy = os.path.splitext(path)[0] + ".json"
+        if path.endswith(".ndjson") and os.path.isfile(legacy):
+            path = legacy
+        else:
+            return []
+    try:
+        records = _load_records(path, os.path.getmtime(path))
+    except Exception:
+        return []
+    if columns:
+        # ensure expected keys exist on every record
+        for rec in records:
+            for c in columns:
+                rec.setdefault(c, "")
+    return records
+
+def append_row(key: str, row: dict):
+    # O(1) list append
+    st.session_state.setdefault(key + "_rows", []).append(row)
+
+@st.cache_data
+def _value_counts(values: tuple):
+    return dict(Counter(values).most_common())
+
+def column_counts(key: str, column: str):
+    # tuple of values is hashable, so identical table states share one cached
+    # count across charts and reruns
+    return _value_counts(tuple(str(r.get(column, "")) for r in st.session_state[key + "_rows"]))
+
+def mark_dirty(key: str, compact: bool = False):
+    st.session_state.setdefault("dirty_tables", set()).add(key)
+    if compact:
+        st.session_state.setdefault("compact_tables", set()).add(key)
+
+def flush_dirty():
+    # write only the tables a mutation actually touched; read-only reruns do no I/O
+    for key in st.session_state.get("dirty_tables", set()):
+        rows = st.session_state[key + "_rows"]
+        path = TABLE_FILES[key]
+        if key in NDJSON_TABLES:
+            persisted = st.session_state.get(key + "_persisted", 0)
+            if key in st.session_state.get("compact_tables", set()) or persisted > len(rows):
+                save_ndjson(path, rows)
+            else:
+                append_ndjson(path, rows[persisted:])
+            st.session_state[key + "_persisted"] = len(rows)
+        else:
+            save_rows_to_file(rows, path)
+    st.session_state.dirty_tables = set()
+    st.session_state.compact_tables = set()
+
+# ---------------------------
+# App UI / startup
+# ---------------------------
+st.set_page_config(page_title="SHA Connect — Kisumu County Referral Hospital", layout="wide")
+st.title("SHA Connect — Kisumu County Referral Hospital")
+st.markdown("An awareness & outreach platform (Swahili, Luo, Luhya, English).")
+
+# Sidebar navigation
+st.sidebar.title("Navigation")
+PAGES = [
+    "Home",
+    "FAQs & Chatbot",
+    "Multilingual Messages",
+    "Outreach Partners",
+    "Community Feedback",
+    "Notifications & Reminders",
+    "Campaign Dashboard",
+    "Outbox",
+    "Settings"
+]
+choice = st.sidebar.radio("Go to:", PAGES)
+
+language_options = ["English", "Swahili", "Luo", "Luhya"]
+selected_language = st.sidebar.selectbox("Choose Language:", language_options)
+
+# ---------------------------
+# Load persisted data into session state
+# ---------------------------
+for _key, _path in TABLE_FILES.items():
+    if _key + "_rows" not in st.session_state:
+        st.session_state[_key + "_rows"] = load_rows_from_file(_path, columns=TABLE_COLUMNS[_key])
+        # rows already on disk in NDJSON form; appends persist only past this point
+        # (0 when loaded from a legacy .json so the first flush writes the full file)
+        st.session_state[_key + "_persisted"] = len(st.session_state[_key + "_rows"]) if os.path.isfile(_path) else 0
+
+# ---------------------------
+# Translation utilities and custom translations
+# ---------------------------
+# Use GoogleTrans when available, else rely on custom dictionary / pass-through.
+# flat (language, phrase) keys: one dict lookup per translation instead of
+# a nested per-language dict fetch
+custom_translations = {
+    ("Luo", "What is SHA?"): "SHA en Social Health Authority, ma orit gi dhok yi mondo giko gi bedo mag dhok.",
+    ("Luo", "How can I register for SHA?"): "Inyalo registr kendo e health center maduong' gi e SHA portal.",
+    ("Luo", "Which services are covered?"): "SHA en giko mag preventive care, maternal care, kod treatments ma nyaka.",
+    ("Luo", "Thank you for your feedback!"): "Awuoyo gi nyalo walo!",
+    ("Luhya", "What is SHA?"): "SHA ni Social Health Authority, ebuya amagara netaweire.",
+    ("Luhya", "How can I register for SHA?"): "Olwikhilire kuhealth center oba e SHA portal.",
+    ("Luhya", "Which services are covered?"): "SHA ibuyire preventive care, maternal care, ne essential treatments.",
+    ("Luhya", "Thank you for your feedback!"): "Webale muno okhu"
+}
+
+@lru_cache(maxsize=512)
+def safe_translate(text: str, lang: str) -> str:
+    """
+    Robust translation helper:
+    - If lang is English: return text
+    - If custom translation exists (Luo/Luhya) and exact phrase matches: use it
+    - If googletrans available and lang == Swahili: translate via googletrans
+    - On any error: return original text
+
+    Memoized: the FAQ page and confirmations translate the same phrases on
+    every rerun, and the Swahili path costs a network round-trip.
+    """
+    if not text:
+        return text
+    # exact-match custom translations for Luo/Luhya
+    if lang in ("Luo", "Luhya"):
+        return custom_translations.get((lang, text), text)
+    if lang == "English":
+        return text
+    if lang == "Swahili":
+        translator = _gt_translator()
+        if translator:
+            try:
+                return translator.translate(text, dest="sw").text
+            except Exception:
+                return text
+        else:
+            return text
+    return text
+
+# ---------------------------
+# FAQs
+# ---------------------------
+faqs = {
+    "What is SHA?": "SHA stands for Social Health Authority, which provides health services and benefits.",
+    "How can I register for SHA?": "You can register at your nearest health center or via the SHA portal.",
+    "Which services are covered?": "SHA covers preventive care, maternal care, and essential treatments."
+}
+
+# lowercased once at startup so each chatbot query avoids re-lowering every
+# question/answer pair on the fly
+_faq_exact = {q.lower(): a for q, a in faqs.items()}
+_faq_index = [(q.lower(), a.lower(), a) for q, a in faqs.items()]
+
+def match_faq(text: str, default=None):
+    key = text.strip().lower()
+    answer = _faq_exact.get(key)
+    if answer is not None:
+        return answer
+    for q_lower, a_lower, a in _faq_index:
+        if key in q_lower or key in a_lower:
+            return a
+    return default
+
+# ---------------------------
+# Twilio + OpenAI configuration helpers
+# ---------------------------
+def twilio_configured() -> bool:
+    # prefer st.secrets; fall back to env
+    has_secrets = ("twilio" in st.secrets and "account_sid" in st.secrets["twilio"] and
+                   "auth_token" in st.secrets["twilio"] and "from_number" in st.secrets["twilio"])
+    if has_secrets:
+        return True
+    # fallback to env
+    return bool(os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_AUTH_TOKEN") and os.getenv("TWILIO_PHONE_NUMBER"))
+
+@st.cache_resource
+def get_twilio_client():
+    # one client per process; every send was constructing (and re-validating)
+    # a fresh REST client before
+    if not twilio_configured():
+        return None
+    try:
+        if "twilio" in st.secrets:
+            sid = st.secrets["twilio"]["account_sid"]
+            token = st.secrets["twilio"]["auth_token"]
+        else:
+            sid = os.getenv("TWILIO_ACCOUNT_SID")
+            token = os.getenv("TWILIO_AUTH_TOKEN")
+        client_cls = _twilio_client_cls()
+        if client_cls is None:
+            return None
+        return client_cls(sid, token)
+    except Exception:
+        return None
+
+def openai_configured() -> bool:
+    return ("openai" in st.secrets and "api_key" in st.secrets["openai"]) or bool(os.getenv("OPENAI_API_KEY"))
+
+@st.cache_resource
+def get_openai_client():
+    openai = _openai_module()
+    if openai is None or not openai_configured():
+        return None
+    try:
+        api_key = st.secrets["openai"]["api_key"] if "openai" in st.secrets else os.getenv("OPENAI_API_KEY")
+        return openai.OpenAI(api_key=api_key)
+    except Exception:
+        return None
+
+# Safe Twilio send functions (wrap in try/except)
+def safe_send_sms(to_number: str, body: str):
+    client = get_twilio_client()
+    if client is None:
+        return False, "Twilio not configured or library missing."
+    try:
+        from_number = st.secrets["twilio"]["from_number"] if "twilio" in st.secrets else os.getenv("TWILIO_PHONE_NUMBER")
+        msg = client.messages.create(body=body, from_=from_number, to=to_number)
+        return True, getattr(msg, "sid", "sent")
+    except Exception as e:
+        return False, str(e)
+
+def safe_make_call(to_number: str, text_to_say: str):
+    client = get_twilio_client()
+    if client is None:
+        return False, "Twilio not configured or library missing."
+    try:
+        from_number = st.secrets["twilio"]["from_number"] if "twilio" in st.secrets else os.getenv("TWILIO_PHONE_NUMBER")
+        call = client.calls.create(twiml=f'<Response><Say>{text_to_say}</Say></Response>', from_=from_number, to=to_number)
+        return True, getattr(call, "sid", "call-initiated")
+    except Exception as e:
+        return False, str(e)
+
+# ---------------------------
+# Outbox management
+# ---------------------------
+def add_to_outbox(recipient, message, language, msg_type="sms"):
+    row = {
+        "Recipient": recipient,
+        "Message": message,
+        "Language": language,
+        "Date Created": now_ts(),
+        "Type": msg_type,
+        "Attempts": 0
+    }
+    append_row("outbox", row)
+    mark_dirty("outbox")
+    flush_dirty()
+    st.success("Message queued to outbox.")
+
+# Twilio throttles per sending/receiving number at roughly 1 msg/sec, so
+# messages sharing a recipient must never fire simultaneously
+MIN_SEND_INTERVAL = 1.0
+
+def _send_outbox_row(row):
+    if row.get("Type", "sms") == "sms":
+        return safe_send_sms(row["Recipient"], row["Message"])
+    return safe_make_call(row["Recipient"], row["Message"])
+
+def _send_recipient_batch(batch):
+    # batch is the (idx, row) pairs for one recipient: sent in order, spaced
+    # at least MIN_SEND_INTERVAL apart; different recipients run in parallel
+    outcomes = []
+    last_send = None
+    for idx, row in batch:
+        if last_send is not None:
+            wait = MIN_SEND_INTERVAL - (time.monotonic() - last_send)
+            if wait > 0:
+                time.sleep(wait)
+        last_send = time.monotonic()
+        ok, info = _send_outbox_row(row)
+        outcomes.append((idx, ok, info))
+    return outcomes
+
+def process_outbox(max_attempts=3):
+    outbox = st.session_state.outbox_rows
+    if not outbox:
+        st.info("Outbox is empty.")
+        return []
+    # partition eligible/exhausted in one pass up front instead of re-checking
+    # attempts inside the send loop
+    eligible = [(idx, row) for idx, row in enumerate(outbox)
+                if int(row.get("Attempts", 0)) < max_attempts]
+    results = [(idx, False, "max attempts reached") for idx, row in enumerate(outbox)
+               if int(row.get("Attempts", 0)) >= max_attempts]
+    sent = set()
+    outcomes = []
+    if eligible:
+        # Twilio sends are network-bound; a small pool overlaps the round-trips
+        # instead of paying them one after another. Grouping by recipient keeps
+        # same-number sends serialized and rate-limited inside one worker.
+        batches = {}
+        for idx, row in eligible:
+            batches.setdefault(row["Recipient"], []).append((idx, row))
+        with ThreadPoolExecutor(max_workers=min(8, len(batches))) as pool:
+            for batch_outcomes in pool.map(_send_recipient_batch, batches.values()):
+                outcomes.extend(batch_outcomes)
+    for idx, ok, info in outcomes:
+        row = outbox[idx]
+        # update attempts
+        row["Attempts"] = int(row.get("Attempts", 0)) + 1
+        if ok:
+            # log into message_logs; the sent row leaves the outbox
+            sent_row = {
+                "Recipient": row["Recipient"],
+                "Message": row["Message"],
+                "Language": row.get("Language", "English"),
+                "Date Sent": now_ts(),
+                "Type": row.get("Type", "sms"),
+                "Status": "Sent"
+            }
+            append_row("message_logs", sent_row)
+            sent.add(idx)
+        results.append((idx, ok, info))
+    results.sort()
+    st.session_state.outbox_rows = [row for idx, row in enumerate(outbox) if idx not in sent]
+    # persist changes; attempts were edited and sent rows removed, so the
+    # outbox file needs compaction rather than an append
+    mark_dirty("outbox", compact=True)
+    mark_dirty("message_logs")
+    flush_dirty()
+    return results
+
+# ---------------------------
+# Partner lookup helpers
+# ---------------------------
+def partner_search_index():
+    # (lowercased name, row) pairs, rebuilt only when the partner list grows;
+    # searching is then a substring test per row with no repeated lowering
+    rows = st.session_state.partners_rows
+    cached = st.session_state.get("_partner_search_index")
+    if cached is None or cached[0] != len(rows):
+        cached = (len(rows), [(str(r.get("Name", "")).lower(), r) for r in rows])
+        st.session_state._partner_search_index = cached
+    return cached[1]
+
+def partner_name_index():
+    # lowercased name -> row index for exact-match lookups (duplicate checks,
+    # search fast path); rebuilt the same way as the search index
+    rows = st.session_state.partners_rows
+    cached = st.session_state.get("_partner_name_index")
+    if cached is None or cached[0] != len(rows):
+        cached = (len(rows), {str(r.get("Name", "")).lower(): i for i, r in enumerate(rows)})
+        st.session_state._partner_name_index = cached
+    return cached[1]
+
+# ---------------------------
+# Utility: persist all main tables
+# ---------------------------
+def persist_all():
+    for key, path in TABLE_FILES.items():
+        rows = st.session_state[key + "_rows"]
+        if key in NDJSON_TABLES:
+            save_ndjson(path, rows)
+            st.session_state[key + "_persisted"] = len(rows)
+        else:
+            save_rows_to_file(rows, path)
+
+# ---------------------------
+# Pages / Functionality
+# ---------------------------
+if choice == "Home":
+    st.subheader("Home")
+    st.markdown("""
+    - Learn about SHA services.
+    - Access resources and community outreach events.
+    - Use the sidebar to navigate: FAQs & Chatbot, Messaging, Partners, Feedback, Reminders, Dashboard.
+    """)
+    st.info("App caches data locally in ./data — this helps in areas with intermittent internet. Use the Outbox page to re-send queued messages when network is back.")
+
+# ---------------------------
+# FAQs & Chatbot
+# ---------------------------
+elif choice == "FAQs & Chatbot":
+    st.subheader("FAQs")
+    for q, a in faqs.items():
+        with st.expander(safe_translate(q, selected_language)):
+            st.write(safe_translate(a, selected_language))
+
+    st.subheader("Ask the Chatbot")
+    user_input = st.text_input("Type your question here:")
+    if st.button("Get Answer"):
+        if not user_input:
+            st.warning("Please enter a question.")
+        else:
+            # Prefer OpenAI if configured and available
+            client = get_openai_client()
+            if client is not None:
+                try:
+                    # stream tokens as they arrive so the first words show up
+                    # immediately instead of after the full completion
+                    stream = client.chat.completions.create(
+                        model="gpt-3.5-turbo",
+                        messages=[{"role": "system", "content": "You are a helpful assistant for SHA health services in Kisumu. Keep answers short and local-language friendly."},
+                                  {"role": "user", "content": user_input}],
+                        stream=True
+                    )
+                    st.markdown("**Chatbot (AI) Response:**")
+                    answer = st.write_stream(chunk.choices[0].delta.content or "" for chunk in stream)
+                    if selected_language != "English":
+                        st.markdown(safe_translate(answer.strip(), selected_language))
+                except Exception as e:
+                    st.error(f"OpenAI error: {e}")
+                    # fallback to simple keyword-based reply
+                    fallback = match_faq(user_input, default="Sorry, I couldn't fetch an AI response. Here is a simple answer attempt.")
+                    st.markdown(f"**Chatbot (Fallback):** {safe_translate(fallback, selected_language)}")
+            else:
+                # simple keyword-based chatbot
+                response = match_faq(user_input, default="Sorry, I don't have an answer for that yet.")
+                st.markdown(f"**Chatbot Response:** {safe_translate(response, selected_language)}")
+
+# ---------------------------
+# Multilingual Messages (SMS/Voice)
+# ---------------------------
+elif choice == "Multilingual Messages":
+    st.subheader("Send Multilingual Messages")
+    if not twilio_configured() or _twilio_client_cls() is None:
+        st.warning("Twilio not configured or library missing. Messages will be queued to Outbox if 'Send' is attempted. To enable live SMS/Voice, set Twilio credentials in Streamlit secrets or environment variables and install twilio library.")
+    # a form batches the text/select widgets into one rerun on submit instead
+    # of a rerun per keystroke or selection
+    with st.form("send_message"):
+        recipient = st.text_input("Recipient phone number (with country code):")
+        msg_text = st.text_area("Message text")
+        col1, col2 = st.columns(2)
+        with col1:
+            msg_type = st.selectbox("Message Type", ["sms", "voice"])
+        with col2:
+            msg_lang = st.selectbox("Message Language", language_options, index=language_options.index(selected_language))
+        send_now = st.form_submit_button("Send Now")
+    if send_now:
+        if not recipient or not msg_text:
+            st.warning("Please enter recipient and message.")
+        else:
+            translated = safe_translate(msg_text, msg_lang)
+            if msg_type == "sms":
+                ok, info = safe_send_sms(recipient, translated) if twilio_configured() and _twilio_client_cls() else (False, "Twilio not configured")
+                if ok:
+                    st.success(f"SMS sent: {info}")
+                    log_row = {
+                        "Recipient": recipient,
+                        "Message": translated,
+                        "Language": msg_lang,
+                        "Date Sent": now_ts(),
+                        "Type": "sms",
+                        "Status": "Sent"
+                    }
+                    append_row("message_logs", log_row)
+                    mark_dirty("message_logs")
+                    flush_dirty()
+                else:
+                    st.error(f"Send failed: {info} — queued to Outbox.")
+                    add_to_outbox(recipient, translated, msg_lang, msg_type="sms")
+            else:
+                ok, info = safe_make_call(recipient, translated) if twilio_configured() and _twilio_client_cls() else (False, "Twilio not configured")
+                if ok:
+                    st.success(f"Voice call initiated: {info}")
+                    log_row = {
+                        "Recipient": recipient,
+                        "Message": translated,
+                        "Language": msg_lang,
+                        "Date Sent": now_ts(),
+                        "Type": "voice",
+                        "Status": "Sent"
+                    }
+                    append_row("message_logs", log_row)
+                    mark_dirty("message_logs")
+                    flush_dirty()
+                else:
+                    st.error(f"Voice send failed: {info} — queued to Outbox.")
+                    add_to_outbox(recipient, translated, msg_lang, msg_type="voice")
+    st.markdown("#### Recent messages")
+    if st.session_state.message_logs_rows:
+        recent = sorted(st.session_state.message_logs_rows, key=lambda r: ts_sort_key(r.get("Date Sent", 0)), reverse=True)[:15]
+        st.dataframe([{**r, "Date Sent": format_ts(r.get("Date Sent", 0))} for r in recent])
+    else:
+        st.info("No messages logged yet.")
+
+# ---------------------------
+# Outreach Partners
+# ---------------------------
+elif choice == "Outreach Partners":
+    st.subheader("Community & Influencer Outreach")
+    with st.expander("Add New Partner"), st.form("add_partner"):
+        name = st.text_input("Partner Name")
+        role = st.selectbox("Role", ["Community Leader", "Influencer", "Volunteer"])
+        langs = st.multiselect("Languages Spoken", language_options)
+        contact = st.text_input("Contact Info (phone/email)")
+        campaign = st.text_input("Campaign Assigned")
+        if st.form_submit_button("Add Partner"):
+            if not name:
+                st.warning("Partner name is required.")
+            else:
+                # duplicate names are allowed (two people can share one);
+                # the index just makes the heads-up check a dict lookup
+                if name.lower() in partner_name_index():
+                    st.warning(f"A partner named {name} is already registered — adding another entry.")
+                new_partner = {
+                    "Name": name,
+                    "Role": role,
+                    "Language": ", ".join(langs),
+                    "Contact": contact,
+                    "Campaign Assigned": campaign
+                }
+                append_row("partners", new_partner)
+                mark_dirty("partners")
+                flush_dirty()
+                st.success(f"Partner {name} added.")
+    st.markdown("#### Registered Partners")
+    if st.session_state.partners_rows:
+        st.dataframe(st.session_state.partners_rows)
+    else:
+        st.info("No partners registered yet.")
+    search = st.text_input("Search partner by name")
+    if search:
+        needle = search.lower()
+        matches = [row for name_lower, row in partner_search_index() if needle in name_lower]
+        st.dataframe(matches)
+
+# ---------------------------
+# Community Feedback
+# ---------------------------
+elif choice == "Community Feedback":
+    st.subheader("Community Feedback")
+    with st.expander("Submit Feedback"), st.form("submit_feedback"):
+        fname = st.text_input("Your Name")
+        fmsg = st.text_area("Your Feedback")
+        flang = st.selectbox("Language", language_options, index=language_options.index(selected_language) if selected_language in language_options else 0)
+        if st.form_submit_button("Submit Feedback"):
+            if not fname or not fmsg:
+                st.warning("Please enter your name and feedback.")
+            else:
+                new_fb = {
+                    "Name": fname,
+                    "Message": fmsg,
+                    "Language": flang,
+                    "Date Submitted": now_ts()
+                }
+                append_row("feedback", new_fb)
+                mark_dirty("feedback")
+                flush_dirty()
+                conf = safe_translate("Thank you for your feedback!", flang)
+                st.success(conf)
+    st.markdown("#### Feedback Received")
+    if st.session_state.feedback_rows:
+        received = sorted(st.session_state.feedback_rows, key=lambda r: ts_sort_key(r.get("Date Submitted", 0)), reverse=True)
+        st.dataframe([{**r, "Date Submitted": format_ts(r.get("Date Submitted", 0))} for r in received])
+        st.markdown("#### Feedback Analytics (by language)")
+        st.bar_chart(column_counts("feedback", "Language"))
+    else:
+        st.info("No feedback yet.")
+
+# ---------------------------
+# Notifications & Reminders
+# ---------------------------
+elif choice == "Notifications & Reminders":
+    st.subheader("Staff Notifications & Reminders")
+    with st.expander("Add New Reminder"), st.form("add_reminder"):
+        task = st.text_input("Task Description")
+        due_date = st.date_input("Due Date", datetime.date.today())
+        assigned_to = st.text_input("Assigned To")
+        if st.form_submit_button("Add Reminder"):
+            if not task or not assigned_to:
+                st.warning("Please enter task and assignee.")
+            else:
+                new_rem = {
+                    "Task": task,
+                    "Due Date": due_date.strftime("%Y-%m-%d"),
+                    "Assigned To": assigned_to,
+                    "Status": "Pending"
+                }
+                append_row("reminders", new_rem)
+                mark_dirty("reminders")
+                flush_dirty()
+                st.success(f"Reminder for '{task}' added.")
+    st.markdown("#### Upcoming Reminders")
+    if st.session_state.reminders_rows:
+        st.dataframe(st.session_state.reminders_rows)
+        # carry the row index through the selectbox so completion is a direct
+        # assignment (duplicate task names no longer all flip at once)
+        pending_tasks = [(i, r["Task"]) for i, r in enumerate(st.session_state.reminders_rows) if r["Status"] == "Pending"]
+        if pending_tasks:
+            selected_idx, selected_task = st.selectbox("Mark completed", pending_tasks, format_func=lambda item: item[1])
+            if st.button("Mark Completed"):
+                st.session_state.reminders_rows[selected_idx]["Status"] = "Completed"
+                mark_dirty("reminders")
+                flush_dirty()
+                st.success(f"Task '{selected_task}' marked completed.")
+    else:
+        st.info("No reminders yet.")
+
+# ---------------------------
+# Campaign Dashboard
+# ---------------------------
+elif choice == "Campaign Dashboard":
+    st.subheader("📊 Campaign Dashboard")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### Messages Sent")
+        if st.session_state.message_logs_rows:
+            st.metric("Total Messages Sent", len(st.session_state.message_logs_rows))
+            st.bar_chart(column_counts("message_logs", "Language"))
+        else:
+            st.info("No messages sent yet.")
+    with col2:
+        st.markdown("### Outreach Partners")
+        if st.session_state.partners_rows:
+            st.metric("Total Partners", len(st.session_state.partners_rows))
+            st.bar_chart(column_counts("partners", "Role"))
+        else:
+            st.info("No partners added yet.")
+    st.markdown("### Community Feedback")
+    if st.session_state.feedback_rows:
+        st.metric("Total Feedback Received", len(st.session_state.feedback_rows))
+        st.bar_chart(column_counts("feedback", "Language"))
+    else:
+        st.info("No feedback yet.")
+    st.markdown("### Reminders")
+    if st.session_state.reminders_rows:
+        pending = sum(1 for r in st.session_state.reminders_rows if r["Status"] == "Pending")
+        completed = sum(1 for r in st.session_state.reminders_rows if r["Status"] == "Completed")
+        st.metric("Pending Reminders", pending)
+        st.metric("Completed Reminders", completed)
+        st.dataframe(st.session_state.reminders_rows)
+    else:
+        st.info("No reminders yet.")
+
+# ---------------------------
+# Outbox (queued messages)
+# ---------------------------
+elif choice == "Outbox":
+    st.subheader("Outbox — queued messages waiting for send")
+    st.markdown("Messages that failed to send (Twilio errors or offline) appear here. Use 'Process Outbox' when network is available.")
+    if st.session_state.outbox_rows:
+        st.dataframe([{**r, "Date Created": format_ts(r.get("Date Created", 0))} for r in st.session_state.outbox_rows])
+    else:
+        st.info("Outbox is empty.")
+    if st.button("Process Outbox (attempt send)"):
+        with st.spinner("Processing outbox..."):
+            try:
+                results = process_outbox()
+                if not results:
+                    st.info("No messages processed.")
+                else:
+                    for idx, ok, info in results:
+                        if ok:
+                            st.success(f"Outbox item {idx} sent: {info}")
+                        else:
+                            st.error(f"Outbox item {idx} NOT sent: {info}")
+            except Exception:
+                st.error("Error while processing outbox.")
+                st.text(traceback.format_exc())
+
+# ---------------------------
+# Settings
+# ---------------------------
+elif choice == "Settings":
+    st.subheader("Settings & Credentials")
+    st.markdown("**Twilio:** optional — configure in Streamlit Secrets or environment variables.")
+    tw_conf = twilio_configured()
+    st.write(f"Twilio configured: {tw_conf}")
+    st.markdown("**OpenAI:** optional — configure in Streamlit Secrets or environment variables.")
+    st.write(f"OpenAI library installed: {_openai_module() is not None}, configured: {openai_configured()}")
+    st.markdown("**Local cache path**: `./data`")
+    if st.button("Save all data to disk now"):
+        persist_all()
+        st.success("All data saved.")